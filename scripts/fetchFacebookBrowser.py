@@ -14,24 +14,38 @@ Facebookの投稿を取得します。
 
   # 投稿取得（スクロール回数指定）
   python scripts/fetchFacebookBrowser.py fetch --url https://www.facebook.com/shota.takasaki.37 --scrolls 20
+
+  # 複数プロフィールの投稿取得（1つのブラウザで並行して取得）
+  python scripts/fetchFacebookBrowser.py fetch --url URL1 URL2
 """
 
 import argparse
+import asyncio
 import json
 import os
+import re
 import sys
 import time
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 
 # Playwrightのインストール確認
 try:
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 except ImportError:
     print("Installing playwright...")
     os.system(f"{sys.executable} -m pip install playwright")
     os.system(f"{sys.executable} -m playwright install chromium")
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+# orjsonがあればJSON保存に使う（なくても動作する）
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # パス設定
 SCRIPT_DIR = Path(__file__).parent
@@ -41,6 +55,78 @@ STATE_FILE = AUTH_DIR / "state.json"
 POSTS_FILE = DATA_DIR / "facebook_posts.json"
 MD_FILE = DATA_DIR / "facebook_posts_for_notebooklm.md"
 
+# ブラウザ設定（投稿テキストの取得に不要なリソースは読み込まない）
+BROWSER_ARGS = [
+    "--disable-gpu",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-dev-shm-usage",
+]
+VIEWPORT = {"width": 1280, "height": 720}
+BLOCKED_RESOURCE_TYPES = {"image", "stylesheet", "font", "media", "imageset", "beacon"}
+SCROLL_TIMEOUT_MS = 3000  # スクロール後に新しい投稿の読み込みを待つ最大時間
+
+# GraphQLレスポンス内の投稿本文（"message":{"text":"..."}）
+GRAPHQL_MESSAGE_RE = re.compile(r'"message":\{"text":"((?:[^"\\]|\\.)*)"')
+
+# 投稿ではないUIテキスト（ボタン等）の書き出し
+UI_PREFIX_RE = re.compile(r'^(?:いいね|コメント|シェア|友達|フォロー)')
+
+# 絵文字（1文字ずつ）
+EMOJI_RE = re.compile(
+    "["
+    "\U0001F300-\U0001F9FF"
+    "\U00002600-\U000026FF"
+    "\U00002700-\U000027BF"
+    "]",
+    flags=re.UNICODE
+)
+
+# DOMから投稿を抽出するセレクター（先頭から順に試し、見つかった時点で終了）
+POST_SELECTORS = [
+    '[data-ad-preview="message"]',
+    'div[dir="auto"][style*="text-align"]',
+    '[data-ad-comet-preview="message"]',
+]
+
+# 要素のテキストをブラウザ内でまとめて取得する（要素ごとのCDP通信を避ける）
+COLLECT_TEXTS_JS = """(selectors) => {
+    const texts = [];
+    for (const selector of selectors) {
+        document.querySelectorAll(selector).forEach(e => texts.push(e.innerText));
+        if (texts.length) break;
+    }
+    return texts;
+}"""
+
+
+async def block_heavy_resources(route):
+    """画像・CSS・フォント等のリクエストを中断する"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def is_post_response(response, main_frame):
+    """投稿データを含むレスポンスかどうか判定"""
+    # 最初の数件はメインフレームのHTMLに埋め込まれ、以降はGraphQLで読み込まれる
+    # （広告やプラグインのiframeのHTMLは対象外）
+    if response.request.resource_type == "document":
+        return response.frame == main_frame
+    return "/api/graphql/" in response.url and response.request.method == "POST"
+
+
+def extract_message_texts(body: str) -> list:
+    """レスポンス本文から投稿テキストを抽出"""
+    texts = []
+    for match in GRAPHQL_MESSAGE_RE.finditer(body):
+        try:
+            texts.append(json.loads(f'"{match.group(1)}"'))
+        except json.JSONDecodeError:
+            continue
+    return texts
+
 
 def setup_auth():
     """認証セットアップ - ブラウザを開いてログイン"""
@@ -68,6 +154,17 @@ def setup_auth():
         browser.close()
 
 
+_storage_state = None
+
+
+def load_storage_state() -> dict:
+    """認証状態を読み込む（同じプロセス内ではファイルを1回だけ読む）"""
+    global _storage_state
+    if _storage_state is None:
+        _storage_state = json.loads(STATE_FILE.read_bytes())
+    return _storage_state
+
+
 def check_auth():
     """認証状態を確認"""
     if not STATE_FILE.exists():
@@ -83,101 +180,157 @@ def check_auth():
     return True
 
 
-def fetch_posts(profile_url: str, max_scrolls: int = 10, show_browser: bool = False):
-    """投稿を取得"""
+async def scrape_profile(browser, profile_url: str, max_scrolls: int) -> list:
+    """1つのプロフィールから投稿テキストを取得（ブラウザは呼び出し側で共有）
+
+    失敗したプロフィールは空のリストを返し、他のプロフィールの取得結果は失わない。
+    """
+    print(f"\n📥 投稿を取得中: {profile_url}")
+
+    context = None
+    try:
+        context = await browser.new_context(storage_state=load_storage_state(), viewport=VIEWPORT)
+        return await collect_profile_texts(context, profile_url, max_scrolls)
+    except Exception as e:
+        print(f"\n❌ 投稿を取得できませんでした（{profile_url}）: {e}")
+        return []
+    finally:
+        if context is not None:
+            await context.close()
+
+
+async def collect_profile_texts(context, profile_url: str, max_scrolls: int) -> list:
+    """プロフィールページをスクロールして投稿テキストを集める"""
+    await context.route("**/*", block_heavy_resources)
+    page = await context.new_page()
+
+    # 投稿データを含むレスポンスの本文を受信時に読み始める
+    # （スクロール後にまとめて読むと、古い本文がブラウザのバッファから消えていることがある）
+    body_tasks = []
+
+    def on_response(response):
+        if is_post_response(response, page.main_frame):
+            task = asyncio.create_task(response.text())
+            # 途中で失敗して回収されなかった場合も警告を出さない
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            body_tasks.append(task)
+
+    page.on("response", on_response)
+
+    # プロフィールページに移動
+    await page.goto(profile_url)
+    await asyncio.sleep(3)
+
+    # ポップアップを閉じる（あれば）
+    try:
+        await page.click('[aria-label="閉じる"]', timeout=2000)
+    except:
+        pass
+
+    print(f"\n📜 スクロールして投稿を読み込み中: {profile_url}")
+
+    for i in range(max_scrolls):
+        # 最下部までスクロールし、ページが伸びる（次の投稿が読み込まれる）まで待つ
+        prev_height = await page.evaluate(
+            "() => { const h = document.body.scrollHeight; window.scrollTo(0, h); return h; }"
+        )
+        try:
+            await page.wait_for_function(
+                "h => document.body.scrollHeight > h",
+                arg=prev_height,
+                timeout=SCROLL_TIMEOUT_MS,
+            )
+        except PlaywrightTimeoutError:
+            print(f"   新しい投稿が読み込まれないため終了します（{profile_url}: {i + 1}/{max_scrolls}）")
+            break
+
+        # 進捗表示
+        print(f"   スクロール {i + 1}/{max_scrolls}（{profile_url}）")
+
+    print(f"\n📝 投稿を抽出中: {profile_url}")
+
+    bodies = await asyncio.gather(*body_tasks, return_exceptions=True)
+    failed = sum(1 for body in bodies if isinstance(body, Exception))
+    if failed:
+        print(f"   ⚠️ {failed}/{len(bodies)} 件のレスポンス本文を読み込めませんでした（{profile_url}）")
+
+    texts = []
+
+    for body in bodies:
+        if isinstance(body, Exception):
+            continue
+        for text in extract_message_texts(body):
+            text = text.strip()
+            if text and len(text) > 10:
+                texts.append(text)
+
+    # レスポンスから取得できない場合はDOMから抽出（Facebookの構造に合わせて調整が必要な場合あり）
+    if not texts:
+        print(f"   レスポンスから取得できませんでした。ページ上の要素から抽出します（{profile_url}）")
+        for text in await page.evaluate(COLLECT_TEXTS_JS, POST_SELECTORS):
+            text = text.strip()
+            if text and len(text) > 10:
+                texts.append(text)
+
+    # もし投稿が取得できない場合、ページ全体のテキストから抽出を試みる
+    if not texts:
+        print(f"   標準セレクターで取得できませんでした。ページ全体から抽出を試みます（{profile_url}）")
+
+        # 投稿らしきテキストブロックを探す
+        for text in await page.evaluate(COLLECT_TEXTS_JS, ['div[dir="auto"]']):
+            text = text.strip()
+            # 投稿らしいもの（一定の長さがあり、UIテキストでない）
+            if 50 < len(text) < 5000 and not UI_PREFIX_RE.match(text):
+                texts.append(text)
+
+    return texts
+
+
+async def fetch_posts_async(profile_urls: list, max_scrolls: int = 10, show_browser: bool = False):
+    """投稿を取得（複数のプロフィールを1つのブラウザで並行して取得）"""
     if not check_auth():
         print("❌ 認証されていません。先に 'auth' コマンドを実行してください。")
         return None
 
-    print(f"\n📥 投稿を取得中: {profile_url}")
+    print(f"\n📥 {len(profile_urls)} 件のプロフィールから投稿を取得します")
     print(f"   スクロール回数: {max_scrolls}")
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     posts = []
+    seen_texts = set()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=not show_browser)
-        context = browser.new_context(storage_state=str(STATE_FILE))
-        page = context.new_page()
-
-        # プロフィールページに移動
-        page.goto(profile_url)
-        time.sleep(3)
-
-        # ポップアップを閉じる（あれば）
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=not show_browser, args=BROWSER_ARGS)
         try:
-            page.click('[aria-label="閉じる"]', timeout=2000)
-        except:
-            pass
-
-        print("\n📜 スクロールして投稿を読み込み中...")
-
-        for i in range(max_scrolls):
-            # スクロール
-            page.evaluate("window.scrollBy(0, 1000)")
-            time.sleep(1.5)
-
-            # 進捗表示
-            print(f"   スクロール {i + 1}/{max_scrolls}", end="\r")
-
-        print("\n\n📝 投稿を抽出中...")
-
-        # 投稿を抽出（Facebookの構造に合わせて調整が必要な場合あり）
-        post_elements = page.query_selector_all('[data-ad-preview="message"]')
-
-        if not post_elements:
-            # 代替セレクター
-            post_elements = page.query_selector_all('div[dir="auto"][style*="text-align"]')
-
-        if not post_elements:
-            # さらに代替
-            post_elements = page.query_selector_all('[data-ad-comet-preview="message"]')
-
-        seen_texts = set()
-
-        for elem in post_elements:
-            try:
-                text = elem.inner_text().strip()
-                if text and len(text) > 10 and text not in seen_texts:
-                    seen_texts.add(text)
-                    posts.append({
-                        "id": f"fb_{len(posts) + 1}",
-                        "text": text,
-                        "created_at": datetime.now().isoformat(),  # 実際の日付は取得困難
-                    })
-            except:
-                continue
-
-        # もし投稿が取得できない場合、ページ全体のテキストから抽出を試みる
-        if not posts:
-            print("   標準セレクターで取得できませんでした。ページ全体から抽出を試みます...")
-
-            # 投稿らしきテキストブロックを探す
-            all_divs = page.query_selector_all('div[dir="auto"]')
-            for div in all_divs:
-                try:
-                    text = div.inner_text().strip()
-                    # 投稿らしいもの（一定の長さがあり、UIテキストでない）
-                    if (text and
-                        len(text) > 50 and
-                        len(text) < 5000 and
-                        text not in seen_texts and
-                        not text.startswith(('いいね', 'コメント', 'シェア', '友達', 'フォロー'))):
-                        seen_texts.add(text)
-                        posts.append({
-                            "id": f"fb_{len(posts) + 1}",
-                            "text": text,
-                            "created_at": datetime.now().isoformat(),
-                        })
-                except:
-                    continue
-
-        browser.close()
+            results = await asyncio.gather(*[
+                scrape_profile(browser, profile_url, max_scrolls) for profile_url in profile_urls
+            ])
+        finally:
+            await browser.close()
+
+    # 実際の日付は取得困難なため、全投稿に取得日時を入れる
+    fetched_at = datetime.now().isoformat()
+
+    # 指定されたURLの順に結合（重複は除外）
+    for texts in results:
+        for text in texts:
+            if text not in seen_texts:
+                seen_texts.add(text)
+                posts.append({
+                    "id": f"fb_{len(posts) + 1}",
+                    "text": text,
+                    "created_at": fetched_at,
+                })
 
     print(f"\n✅ {len(posts)} 件の投稿を取得しました")
     return posts
 
 
+def fetch_posts(profile_urls: list, max_scrolls: int = 10, show_browser: bool = False):
+    """投稿を取得"""
+    return asyncio.run(fetch_posts_async(profile_urls, max_scrolls, show_browser))
+
+
 def analyze_writing_style(posts: list) -> dict:
     """文体を分析"""
     if not posts:
@@ -187,22 +340,8 @@ def analyze_writing_style(posts: list) -> dict:
     all_text = " ".join(texts)
 
     # 絵文字抽出
-    import re
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F300-\U0001F9FF"
-        "\U00002600-\U000026FF"
-        "\U00002700-\U000027BF"
-        "]+",
-        flags=re.UNICODE
-    )
-    emojis = emoji_pattern.findall(all_text)
-    emoji_count = {}
-    for e in emojis:
-        for char in e:
-            emoji_count[char] = emoji_count.get(char, 0) + 1
-
-    top_emojis = sorted(emoji_count.items(), key=lambda x: -x[1])[:10]
+    emoji_count = Counter(EMOJI_RE.findall(all_text))
+    top_emojis = emoji_count.most_common(10)
 
     return {
         "total_posts": len(posts),
@@ -211,6 +350,16 @@ def analyze_writing_style(posts: list) -> dict:
     }
 
 
+def write_json(path, data):
+    """JSONを保存（orjsonがインストールされていれば高速に書き出す）"""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
 def save_posts(posts: list, profile_name: str = "高崎翔太"):
     """投稿を保存"""
     if not posts:
@@ -228,13 +377,12 @@ def save_posts(posts: list, profile_name: str = "高崎翔太"):
         "writing_style": style,
     }
 
-    with open(POSTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(archive, f, ensure_ascii=False, indent=2)
+    write_json(POSTS_FILE, archive)
 
     print(f"📁 JSON保存: {POSTS_FILE}")
 
     # Markdown保存（NotebookLM用）
-    md_content = f"""# {profile_name}のFacebook投稿アーカイブ
+    md_header = f"""# {profile_name}のFacebook投稿アーカイブ
 
 ## 文体分析
 
@@ -248,13 +396,10 @@ def save_posts(posts: list, profile_name: str = "高崎翔太"):
 
 """
 
-    for i, post in enumerate(posts, 1):
-        md_content += f"### {i}. 投稿\n\n"
-        md_content += f"{post['text']}\n\n"
-        md_content += "---\n\n"
-
     with open(MD_FILE, "w", encoding="utf-8") as f:
-        f.write(md_content)
+        f.write(md_header)
+        for i, post in enumerate(posts, 1):
+            f.write(f"### {i}. 投稿\n\n{post['text']}\n\n---\n\n")
 
     print(f"📁 Markdown保存: {MD_FILE}")
     print(f"\n✅ NotebookLMには {MD_FILE} をアップロードしてください")
@@ -269,7 +414,7 @@ def main():
 
     # fetch コマンド
     fetch_parser = subparsers.add_parser("fetch", help="投稿を取得")
-    fetch_parser.add_argument("--url", required=True, help="プロフィールURL")
+    fetch_parser.add_argument("--url", required=True, nargs="+", help="プロフィールURL（複数指定可）")
     fetch_parser.add_argument("--scrolls", type=int, default=10, help="スクロール回数")
     fetch_parser.add_argument("--show", action="store_true", help="ブラウザを表示")
     fetch_parser.add_argument("--name", default="高崎翔太", help="プロフィール名")
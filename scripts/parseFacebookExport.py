@@ -5,10 +5,19 @@ Facebook Export HTML を解析して NotebookLM 用 Markdown を生成
 
 import re
 import json
+import mmap
+import os
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 from html import unescape
 
+# orjsonがあればJSON保存に使う（なくても動作する）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # パス設定
 EXPORT_PATH = Path("/Users/takasaki19841121/Desktop/ifJukuManager/facebook-shotatakasaki37-2026_01_19-XwtXfVf2")
 POSTS_HTML = EXPORT_PATH / "your_facebook_activity" / "posts" / "your_posts__check_ins__photos_and_videos_1.html"
@@ -16,74 +25,113 @@ OUTPUT_DIR = Path(__file__).parent.parent / "data" / "social"
 JSON_OUTPUT = OUTPUT_DIR / "facebook_posts.json"
 MD_OUTPUT = OUTPUT_DIR / "facebook_posts_for_notebooklm.md"
 
+# 正規表現（呼び出しごとのコンパイルを避けるため事前に用意）
+# 改行タグ／リンク／その他のタグを1回の置換で処理する
+MARKUP_RE = re.compile(r'(?P<br><br\s*/?>)|<a[^>]*>(?P<link>[^<]*)</a>|<[^>]+>')
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
+DATE_STR_RE = re.compile(r'(\d+)月\s*(\d+),\s*(\d+)')
+# ひらがな（ぁ-ん）、カタカナ（ァ-ン）、漢字（一-龥）のUTF-8バイト列
+JAPANESE_BYTES = (
+    rb'\xe3\x81[\x81-\xbf]|\xe3\x82[\x80-\x93]'
+    rb'|\xe3\x82[\xa1-\xbf]|\xe3\x83[\x80-\xb3]'
+    rb'|\xe4[\xb8-\xbf][\x80-\xbf]|[\xe5-\xe8][\x80-\xbf]{2}'
+    rb'|\xe9[\x80-\xbd][\x80-\xbf]|\xe9\xbe[\x80-\xa5]'
+)
+# 日付のdivと、日本語を含むテキストブロックを文書順に拾う（UTF-8のまま走査する）
+# 投稿部分は先読みで最初のテキストに日本語があることを確かめ、
+# 本文は「<br>/<a>とその後のテキストの繰り返し」としてどの量指定子も範囲が重ならないようにしている
+BLOCK_RE = re.compile(
+    rb'<div class="_a72d">(?P<date>[^<]+)</div>'
+    rb'|<div>(?=[^<]*?(?:' + JAPANESE_BYTES + rb'))'
+    rb'(?P<post>[^<]*(?:(?:<br\s*/?>|<a[^>]*>[^<]*</a>)[^<]*)*)</div>',
+    re.DOTALL
+)
+# 絵文字（1文字ずつ）
+EMOJI_RE = re.compile(
+    "["
+    "\U0001F300-\U0001F9FF"
+    "\U00002600-\U000026FF"
+    "\U00002700-\U000027BF"
+    "✨👍🏻"
+    "]",
+    flags=re.UNICODE
+)
+
+
+def replace_markup(match):
+    """<br> は改行、リンクはテキストのみ残し、その他のタグは削除"""
+    if match.group('br') is not None:
+        return '\n'
+    return match.group('link') or ''
+
+
+def decode_text(raw):
+    """UTF-8のバイト列をデコードし、改行をLFに揃える（テキストモードでの読み込みと同じ扱い）"""
+    return raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
 
 def clean_text(text):
     """HTMLタグを除去してテキストをクリーンアップ"""
-    text = re.sub(r'<br\s*/?>', '\n', text)
-    text = re.sub(r'<a[^>]*>([^<]*)</a>', r'\1', text)
-    text = re.sub(r'<[^>]+>', '', text)
+    text = MARKUP_RE.sub(replace_markup, text)
     text = unescape(text)
-    text = re.sub(r'\n\s*\n', '\n\n', text)
+    text = BLANK_LINES_RE.sub('\n\n', text)
     return text.strip()
 
 
 def is_meaningful_text(text):
     """有用なテキストかどうか判定"""
-    if not text or len(text) < 30:
-        return False
-    if 'に更新' in text and len(text) < 50:
-        return False
-    if text.startswith('http') and len(text) < 100:
+    length = len(text)
+    if length < 30:
         return False
     if '高崎 翔太さんが' in text:
         return False
-    if text.startswith('場所:') and len(text) < 100:
-        return False
+    # 短いテキストだけに当てはまる条件（長い投稿はここを通らない）
+    if length < 100:
+        if text.startswith(('http', '場所:')):
+            return False
+        if length < 50 and 'に更新' in text:
+            return False
     return True
 
 
-def extract_date_for_text(html_content, text_start_pos):
-    """テキストの位置から最も近い日付を取得"""
-    # テキストの前にある最も近い日付を探す
-    search_area = html_content[:text_start_pos]
-    dates = re.findall(r'<div class="_a72d">([^<]+)</div>', search_area)
-    if dates:
-        return dates[-1]  # 最後に見つかった日付（最も近い）
-    return None
-
-
 def parse_posts():
     """HTMLファイルを解析して投稿を抽出"""
     print(f"📖 読み込み中: {POSTS_HTML}")
 
-    with open(POSTS_HTML, "r", encoding="utf-8") as f:
-        html_content = f.read()
-
     posts = []
-    seen_texts = set()
-
-    # 日本語を含むテキストブロックを抽出
-    # ひらがな、カタカナ、漢字を含むdiv
-    pattern = r'<div>([^<]*[ぁ-んァ-ン一-龥][^<]*(?:<br\s*/?>|<a[^>]*>[^<]*</a>)*[^<]*)</div>'
-
-    for match in re.finditer(pattern, html_content, re.DOTALL):
-        raw_text = match.group(1)
-        text = clean_text(raw_text)
-
-        if is_meaningful_text(text):
-            # 重複チェック
-            text_key = text[:80]
-            if text_key not in seen_texts:
-                seen_texts.add(text_key)
-
-                # 日付を取得
-                date = extract_date_for_text(html_content, match.start())
-
-                posts.append({
-                    "date": date,
-                    "text": text,
-                    "has_content": True
-                })
+    seen_keys = set()  # 先頭80文字のハッシュ値（文字列を保持せずに重複判定する）
+    date = None  # 直前に現れた日付（テキストの前にある最も近い日付）
+
+    # ファイル全体をデコードせず、メモリマップしたUTF-8のまま走査する
+    with open(POSTS_HTML, "rb") as f:
+        # 空のファイルはmmapできないため、投稿なしとして扱う
+        if os.fstat(f.fileno()).st_size == 0:
+            print("✅ 0 件のテキスト投稿を抽出しました")
+            return posts
+
+        html_content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with html_content:
+        # 日付と日本語を含むテキストブロックを1回の走査で抽出
+        for match in BLOCK_RE.finditer(html_content):
+            if match.group('date') is not None:
+                date = decode_text(match.group('date'))
+                continue
+
+            raw_text = decode_text(match.group('post'))
+            text = clean_text(raw_text)
+
+            if is_meaningful_text(text):
+                # 重複チェック
+                text_key = hash(text[:80])
+                if text_key not in seen_keys:
+                    seen_keys.add(text_key)
+
+                    posts.append({
+                        "date": date,
+                        "text": text,
+                        "has_content": True
+                    })
 
     # 日付でソート（新しい順）
     def parse_date(date_str):
@@ -96,7 +144,7 @@ def parse_posts():
             for jp_month, num in months.items():
                 if jp_month in date_str:
                     date_str = date_str.replace(jp_month, f"{num}月")
-            match = re.match(r'(\d+)月\s*(\d+),\s*(\d+)', date_str)
+            match = DATE_STR_RE.match(date_str)
             if match:
                 m, d, y = match.groups()
                 return datetime(int(y), int(m), int(d))
@@ -116,24 +164,12 @@ def analyze_writing_style(posts):
         return {"total_posts": 0}
 
     texts = [p["text"] for p in posts]
+    lengths = [len(t) for t in texts]
     all_text = " ".join(texts)
 
     # 絵文字抽出
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F300-\U0001F9FF"
-        "\U00002600-\U000026FF"
-        "\U00002700-\U000027BF"
-        "✨👍🏻"
-        "]+",
-        flags=re.UNICODE
-    )
-    emojis = emoji_pattern.findall(all_text)
-    emoji_count = {}
-    for e in emojis:
-        for char in e:
-            emoji_count[char] = emoji_count.get(char, 0) + 1
-    top_emojis = sorted(emoji_count.items(), key=lambda x: -x[1])[:10]
+    emoji_count = Counter(EMOJI_RE.findall(all_text))
+    top_emojis = emoji_count.most_common(10)
 
     # よく使う表現
     expressions = []
@@ -152,13 +188,23 @@ def analyze_writing_style(posts):
 
     return {
         "total_posts": len(posts),
-        "average_length": sum(len(t) for t in texts) // len(texts) if texts else 0,
-        "max_length": max(len(t) for t in texts) if texts else 0,
+        "average_length": sum(lengths) // len(lengths),
+        "max_length": max(lengths),
         "top_emojis": [e[0] for e in top_emojis],
         "expressions": expressions,
     }
 
 
+def write_json(path, data):
+    """JSONを保存（orjsonがインストールされていれば高速に書き出す）"""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
 def save_results(posts):
     """結果を保存"""
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -175,12 +221,11 @@ def save_results(posts):
         "writing_style": style,
     }
 
-    with open(JSON_OUTPUT, "w", encoding="utf-8") as f:
-        json.dump(archive, f, ensure_ascii=False, indent=2)
+    write_json(JSON_OUTPUT, archive)
     print(f"📁 JSON保存: {JSON_OUTPUT}")
 
     # Markdown保存
-    md_content = f"""# 高崎翔太のFacebook投稿アーカイブ
+    md_header = f"""# 高崎翔太のFacebook投稿アーカイブ
 
 ## 概要
 
@@ -223,13 +268,10 @@ def save_results(posts):
 
 """
 
-    for i, post in enumerate(posts, 1):
-        md_content += f"### {i}. {post.get('date', '日付不明')}\n\n"
-        md_content += f"{post['text']}\n\n"
-        md_content += "---\n\n"
-
     with open(MD_OUTPUT, "w", encoding="utf-8") as f:
-        f.write(md_content)
+        f.write(md_header)
+        for i, post in enumerate(posts, 1):
+            f.write(f"### {i}. {post.get('date', '日付不明')}\n\n{post['text']}\n\n---\n\n")
     print(f"📁 Markdown保存: {MD_OUTPUT}")
     print(f"\n✅ NotebookLMには {MD_OUTPUT} をアップロードしてください")
 